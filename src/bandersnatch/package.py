@@ -134,19 +134,35 @@ class Package:
         """
         Filter release files and remove empty releases after doing so.
         """
-        releases = list(self.releases.keys())
-        for version in releases:
-            release_files = list(self.releases[version])
-            for rfindex in reversed(range(len(release_files))):
-                metadata = {
-                    "info": self.info,
-                    "release": version,
-                    "release_file": self.releases[version][rfindex],
-                }
-                if not all(plugin.filter(metadata) for plugin in release_file_filters):
-                    del self.releases[version][rfindex]
-            if not self.releases[version]:
-                del self.releases[version]
+        # Bind the releases dict once, self.releases goes through two
+        # properties on every access
+        all_releases = self.releases
+        releases = list(all_releases.items())
+        if not release_file_filters:
+            # Nothing to filter the files with (the usual configuration), only
+            # drop the releases without any files
+            for version, release_files in releases:
+                if not release_files:
+                    del all_releases[version]
+            return bool(releases)
+
+        info = self.info
+        for version, release_files in releases:
+            # Rebuild the file list in one pass rather than deleting the
+            # filtered files one by one, which shifts the rest of the list
+            # every time. Slice assignment keeps the same list object.
+            release_files[:] = [
+                release_file
+                for release_file in release_files
+                if all(
+                    plugin.filter(
+                        {"info": info, "release": version, "release_file": release_file}
+                    )
+                    for plugin in release_file_filters
+                )
+            ]
+            if not release_files:
+                del all_releases[version]
 
         if releases:
             return True
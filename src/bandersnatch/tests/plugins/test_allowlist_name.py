@@ -354,6 +354,59 @@ packages =
 
         self.assertEqual(pkg.releases, {"1.2.0": {}})
 
+    def test__filter__matches__release__multiple__specifiers(self) -> None:
+        mock_config(
+            """\
+[mirror]
+storage-backend = filesystem
+workers = 2
+
+[plugins]
+enabled =
+    allowlist_release
+[allowlist]
+packages =
+    foo==1.2.0
+    bar<2
+    foo==1.2.2
+"""
+        )
+
+        mirror = BandersnatchMirror(Path("."), Master(url="https://foo.bar.com"))
+        pkg = Package("foo", 1)
+        pkg._metadata = {
+            "info": {"name": "foo"},
+            "releases": {"1.2.0": {}, "1.2.1": {}, "1.2.2": {}},
+        }
+
+        pkg.filter_all_releases(mirror.filters.filter_release_plugins())
+
+        self.assertEqual(pkg.releases, {"1.2.0": {}, "1.2.2": {}})
+
+    def test__requirements__not__shared__between__plugins(self) -> None:
+        mock_config(
+            """\
+[plugins]
+enabled =
+    allowlist_release
+[allowlist]
+packages =
+    foo==1.2.0
+"""
+        )
+
+        first, second = (
+            bandersnatch.filter.LoadedFilters().filter_release_plugins()[0]
+            for _ in range(2)
+        )
+        (requirement,) = first.allowlist_release_requirements  # type: ignore
+        requirement.name = "bar"
+        requirement.specifier.prereleases = False
+
+        (other,) = second.allowlist_release_requirements  # type: ignore
+        self.assertEqual(other.name, "foo")
+        self.assertTrue(other.specifier.prereleases)
+
 
 class TestAllowlistRequirements(TestCase):
     """
@@ -229,6 +229,63 @@ packages =
 
         self.assertEqual(pkg.releases, {"1.2.1": {}})
 
+    def test__filter__matches__release__multiple__specifiers(self) -> None:
+        mock_config(
+            """\
+[plugins]
+enabled =
+    blocklist_release
+[blocklist]
+packages =
+    foo==1.2.0
+    bar<2
+    foo==1.2.2
+"""
+        )
+
+        mirror = BandersnatchMirror(Path("."), Master(url="https://foo.bar.com"))
+        pkg = Package("foo", 1)
+        pkg._metadata = {
+            "info": {"name": "foo"},
+            "releases": {"1.2.0": {}, "1.2.1": {}, "1.2.2": {}},
+        }
+
+        pkg.filter_all_releases(mirror.filters.filter_release_plugins())
+
+        self.assertEqual(pkg.releases, {"1.2.1": {}})
+
+    def test__filter__matches__release__exact__pins(self) -> None:
+        mock_config(
+            """\
+[plugins]
+enabled =
+    blocklist_release
+[blocklist]
+packages =
+    foo==1.2
+    foo==1.3+local
+    foo>=2
+"""
+        )
+
+        mirror = BandersnatchMirror(Path("."), Master(url="https://foo.bar.com"))
+        pkg = Package("foo", 1)
+        pkg._metadata = {
+            "info": {"name": "foo"},
+            "releases": {
+                "1.2.0": {},
+                "1.2+abc": {},
+                "1.2.1": {},
+                "1.3": {},
+                "1.3+local": {},
+                "2.0": {},
+            },
+        }
+
+        pkg.filter_all_releases(mirror.filters.filter_release_plugins())
+
+        self.assertEqual(pkg.releases, {"1.2.1": {}, "1.3": {}})
+
     def test__dont__filter__prereleases(self) -> None:
         mock_config(
             """\
@@ -197,3 +197,116 @@ platforms =
 
         # the release "0.2" should have been deleted since there is no more file in it
         assert len(pkg.releases.keys()) == 3
+
+    def test_plugin_instances_keep_own_patterns(self) -> None:
+        plugins = []
+        for platforms in ("windows", "freebsd"):
+            mock_config(
+                f"""\
+[plugins]
+enabled =
+    exclude_platform
+
+[blocklist]
+platforms =
+    {platforms}
+"""
+            )
+            plugins.extend(
+                bandersnatch.filter.LoadedFilters().filter_release_file_plugins()
+            )
+
+        windows, freebsd = plugins
+        assert isinstance(windows, filename_name.ExcludePlatformFilter)
+        assert isinstance(freebsd, filename_name.ExcludePlatformFilter)
+        assert windows._patterns == [".win32", "-win32", "win_amd64", "win-amd64"]
+        assert windows._packagetypes == ["bdist_msi", "bdist_wininst"]
+        assert freebsd._patterns == [".freebsd", "-freebsd"]
+        assert freebsd._packagetypes == []
+        assert freebsd._check_match({"filename": "foobar-1.0-win32.whl"}) is False
+
+    def test_initialization_is_not_logged_at_info(self) -> None:
+        mock_config(self.config_contents)
+        with self.assertLogs(filename_name.logger, level="DEBUG") as logs:
+            for _ in range(3):
+                bandersnatch.filter.LoadedFilters().filter_release_file_plugins()
+
+        levels = {
+            record.levelname
+            for record in logs.records
+            if record.getMessage().startswith("Initialized exclude_platform")
+        }
+        assert levels == {"DEBUG"}
+
+    def _filter_filenames(self, platforms: str) -> list[str]:
+        """Return the filenames of a sample release kept by the filter when
+        configured with the given platforms"""
+        mock_config(
+            f"""\
+[plugins]
+enabled =
+    exclude_platform
+
+[blocklist]
+platforms =
+    {platforms}
+"""
+        )
+
+        mirror = BandersnatchMirror(Path("."), Master(url="https://foo.bar.com"))
+        pkg = Package("foobar", 1)
+        pkg._metadata = {
+            "info": {"name": "foobar", "version": "1.0"},
+            "releases": {
+                "1.0": [
+                    {"packagetype": "sdist", "filename": "foobar-1.0.tar.gz"},
+                    {
+                        "packagetype": "bdist_egg",
+                        "filename": "foobar-1.0-freebsd-6.0-RELEASE-i386.egg",
+                    },
+                    {
+                        "packagetype": "bdist_wheel",
+                        "filename": "foobar-1.0-cp39-cp39-manylinux1_x86_64.whl",
+                    },
+                    {
+                        "packagetype": "bdist_wheel",
+                        "filename": "foobar-1.0-cp39-cp39-linux_armv7l.whl",
+                    },
+                    {"packagetype": "bdist_rpm", "filename": "foobar-1.0.noarch.rpm"},
+                    {
+                        "packagetype": "bdist_wheel",
+                        "filename": "foobar-1.0-cp39-cp39-win_amd64.whl",
+                    },
+                    {
+                        "packagetype": "bdist_wheel",
+                        "filename": "foobar-1.0-cp39-cp39-macosx_10_14_x86_64.whl",
+                    },
+                ],
+            },
+        }
+
+        pkg.filter_all_releases_files(mirror.filters.filter_release_file_plugins())
+
+        return [f["filename"] for f in pkg.releases["1.0"]]
+
+    def test_exclude_freebsd_and_linux(self) -> None:
+        assert self._filter_filenames("freebsd\n    linux") == [
+            "foobar-1.0.tar.gz",
+            "foobar-1.0-cp39-cp39-win_amd64.whl",
+            "foobar-1.0-cp39-cp39-macosx_10_14_x86_64.whl",
+        ]
+
+    def test_exclude_platform_substrings_match_nothing(self) -> None:
+        """
+        Only the full platform names select the freebsd and linux exclusions,
+        parts of them (which used to match as substrings) keep every file
+        """
+        assert self._filter_filenames("bsd\n    nux") == [
+            "foobar-1.0.tar.gz",
+            "foobar-1.0-freebsd-6.0-RELEASE-i386.egg",
+            "foobar-1.0-cp39-cp39-manylinux1_x86_64.whl",
+            "foobar-1.0-cp39-cp39-linux_armv7l.whl",
+            "foobar-1.0.noarch.rpm",
+            "foobar-1.0-cp39-cp39-win_amd64.whl",
+            "foobar-1.0-cp39-cp39-macosx_10_14_x86_64.whl",
+        ]
@@ -168,6 +168,31 @@ keep = 2
         assert pkg1.releases == {"1.2.0": {}, "2.0.0": {}}
         assert pkg2.releases == {"0.2.0": {}, "0.3.0": {}}
 
+    def test_latest_releases_removed_by_other_filter(self) -> None:
+        """
+        Tests that the latest versions are picked again when one of them was
+        removed from the releases in the meantime
+        """
+        mock_config(self.config_contents)
+
+        plugin = next(
+            plugin
+            for plugin in bandersnatch.filter.LoadedFilters().filter_release_plugins()
+            if isinstance(plugin, latest_name.LatestReleaseFilter)
+        )
+        info = {"name": "foo", "version": "2.0.0"}
+        releases: dict = {"1.0.0": {}, "1.1.0": {}, "2.0.0": {}, "3.0.0b1": {}}
+
+        assert plugin.filter({"info": info, "releases": releases, "version": "3.0.0b1"})
+        assert not plugin.filter(
+            {"info": info, "releases": releases, "version": "1.1.0"}
+        )
+        del releases["3.0.0b1"]
+        assert plugin.filter({"info": info, "releases": releases, "version": "1.1.0"})
+        assert not plugin.filter(
+            {"info": info, "releases": releases, "version": "1.0.0"}
+        )
+
 
 class TestLatestReleaseFilterUninitialized(BasePluginTestCase):
     config_contents = """\
@@ -11,7 +11,10 @@ from bandersnatch.master import Master
 from bandersnatch.mirror import BandersnatchMirror
 from bandersnatch.package import Package
 from bandersnatch.tests.mock_config import mock_config
-from bandersnatch_filter_plugins.metadata_filter import SizeProjectMetadataFilter
+from bandersnatch_filter_plugins.metadata_filter import (
+    RegexProjectMetadataFilter,
+    SizeProjectMetadataFilter,
+)
 
 pytestmark = pytest.mark.asyncio(loop_scope="class")
 
@@ -131,3 +134,54 @@ packages =
             "releases": {"1.2.0": [{"size": 1024}], "1.2.1": [{"size": 1025}]},
         }
         self.assertFalse(pkg.filter_metadata(mirror.filters.filter_metadata_plugins()))
+
+
+class TestRegexProjectMetadataFilter(TestCase):
+    """
+    Tests for the bandersnatch filtering by project metadata patterns
+    """
+
+    def setUp(self) -> None:
+        self.cwd = os.getcwd()
+        self.tempdir = TemporaryDirectory()
+        os.chdir(self.tempdir.name)
+
+    def tearDown(self) -> None:
+        if self.tempdir:
+            assert self.cwd
+            os.chdir(self.cwd)
+            self.tempdir.cleanup()
+
+    def test__filter__any__of__multiple__patterns(self) -> None:
+        mock_config(
+            """\
+[plugins]
+enabled =
+    regex_project_metadata
+
+[regex_project_metadata]
+info.name =
+    foo.*
+    bar\\d
+info.summary =
+    (a+)b\\1
+    x
+"""
+        )
+
+        plugins = bandersnatch.filter.LoadedFilters().filter_metadata_plugins()
+        self.assertEqual(len(plugins), 1)
+        plugin = cast(RegexProjectMetadataFilter, plugins[0])
+        # Patterns with groups are matched one by one so backreferences work
+        self.assertListEqual(list(plugin.combined_patterns), ["info.name"])
+
+        for name, summary, expected in (
+            ("foo", "x", True),
+            ("bar1", "aba", True),
+            ("foobar", None, True),
+            ("bar", "x", False),
+            ("baz", "aba", False),
+            ("bar1", "abb", False),
+        ):
+            metadata = {"info": {"name": name, "summary": summary}}
+            self.assertEqual(plugin.filter(metadata), expected, metadata)
@@ -18,6 +18,7 @@ from unittest import TestCase, mock
 import pytest
 
 import bandersnatch.storage
+import bandersnatch.utils
 from bandersnatch.master import Master
 from bandersnatch.mirror import BandersnatchMirror
 from bandersnatch.package import Package
@@ -677,6 +678,20 @@ web{0}simple{0}index.html""".format(
                     self.plugin.hash_file(path, function=hash_func), hash_val
                 )
 
+    def test_utils_hash(self) -> None:
+        # verify hashes release files with bandersnatch.utils.hash, which has
+        # to read them through the backend rather than the local filesystem
+        path = self.plugin.PATH_BACKEND(self.sample_file)
+        sha256_digest = (
+            "95c07c174663ebff531eed59b326ebb3fa95f418f680349fc33b07dfbcf29f18"
+        )
+        # newlines make the hash different here
+        if sys.platform == "win32":
+            sha256_digest = (
+                "398e162e08d9af1d87c8eb2ee46d7c64248867afbe30dee807122022dc497332"
+            )
+        self.assertEqual(bandersnatch.utils.hash(path), sha256_digest)
+
     def test_iter_dir(self) -> None:
         base_path = self.plugin.PATH_BACKEND(self.simple_base_path)
         lists = [
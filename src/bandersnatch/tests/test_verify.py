@@ -1,4 +1,6 @@
+import asyncio
 import configparser
+import json
 import os
 import sys
 import unittest.mock as mock
@@ -39,6 +41,10 @@ def some_dirs(*args: Any, **kwargs: Any) -> list[str]:
     return ["/data/pypi/web/json/bandersnatch", "/data/pypi/web/json/black"]
 
 
+async def some_package_files(*_: Any, **__: Any) -> list[Path]:
+    return [Path("/data/pypi/web/packages/a0/package.tar.gz")]
+
+
 def some_paths(*_: Any, **__: Any) -> list[Path]:
     return [Path("/data/pypi/web/json/bandersnatch"), Path("/data/pypi/web/json/black")]
 
@@ -154,8 +160,36 @@ async def test_verify_producer(monkeypatch: MonkeyPatch) -> None:
     fc["mirror"]["verifiers"] = "2"
     master = Master("https://unittest.org")
     json_files = ["web/json/bandersnatch", "web/json/black"]
-    monkeypatch.setattr(bandersnatch.verify, "verify", do_nothing)
-    await verify_producer(master, fc, [], fm.mirror_base, json_files, mock.Mock(), None)
+    monkeypatch.setattr(bandersnatch.verify, "verify", some_package_files)
+    all_package_files = await verify_producer(
+        master, fc, fm.mirror_base, json_files, mock.Mock(), None
+    )
+    assert all_package_files == {Path("/data/pypi/web/packages/a0/package.tar.gz")}
+
+
+@pytest.mark.asyncio
+async def test_verify_producer_runs_verifiers_concurrently(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    fc = configparser.ConfigParser()
+    fc["mirror"] = {}
+    fc["mirror"]["verifiers"] = "2"
+    master = Master("https://unittest.org")
+    json_files = ["web/json/bandersnatch", "web/json/black"]
+    started = 0
+    all_started = asyncio.Event()
+
+    async def wait_for_other_verifier(*_: Any, **__: Any) -> list[Path]:
+        nonlocal started
+        started += 1
+        if started == len(json_files):
+            all_started.set()
+        await asyncio.wait_for(all_started.wait(), timeout=5)
+        return []
+
+    monkeypatch.setattr(bandersnatch.verify, "verify", wait_for_other_verifier)
+    await verify_producer(master, fc, Path(), json_files, mock.Mock(), None)
+    assert started == len(json_files)
 
 
 def test_fake_mirror() -> None:
@@ -251,10 +285,8 @@ async def test_get_latest_json_timeout(
     jsonpath.mkdir(parents=True)
     jsonfile = jsonpath / "bandersnatch"
     jsonfile.touch()
-    all_package_files: list[Path] = []
-
-    await verify(
-        master, fc, "bandersnatch", tmp_path, all_package_files, fa  # type: ignore
+    all_package_files = await verify(
+        master, fc, "bandersnatch", tmp_path, fa  # type: ignore
     )  # noqa: E501
     assert jsonfile.exists()
     assert not all_package_files
@@ -281,10 +313,8 @@ async def test_get_latest_json_404(tmp_path: Path, monkeypatch: MonkeyPatch) ->
     jsonpath.mkdir(parents=True)
     jsonfile = jsonpath / "bandersnatch"
     jsonfile.touch()
-    all_package_files: list[Path] = []
-
-    await verify(
-        master, fc, "bandersnatch", tmp_path, all_package_files, fa  # type: ignore # noqa: E501
+    all_package_files = await verify(
+        master, fc, "bandersnatch", tmp_path, fa  # type: ignore # noqa: E501
     )
     assert not jsonfile.exists()
     assert not all_package_files
@@ -314,12 +344,168 @@ async def test_verify_url_exception(tmp_path: Path, monkeypatch: MonkeyPatch) ->
         f.write(
             '{"releases":{"1.0":["url":"https://unittests.org/packages/a0/a0/a0a0/package-1.0.0.exe"}]}}'  # noqa: E501
         )
-    all_package_files: list[Path] = []
-
-    await verify(master, fc, "bandersnatch", tmp_path, all_package_files, fa)  # type: ignore # noqa: E501
+    all_package_files = await verify(master, fc, "bandersnatch", tmp_path, fa)  # type: ignore # noqa: E501
     assert jsonfile.exists()
     assert not all_package_files
 
 
+@pytest.mark.asyncio
+async def test_verify_fetches_and_hashes(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    class FakeArgs:
+        delete = True
+        dry_run = False
+        json_update = False
+        workers = 2
+
+    fa = FakeArgs()
+    fc = FakeConfig()
+
+    async def fetch(url: str, save_path: Path, *args: Any) -> None:
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        await fake_fetch(url, save_path, *args)
+
+    master = Master(fc.get("mirror", "master"))
+    url_fetch = AsyncMock(side_effect=fetch)
+    monkeypatch.setattr(master, "url_fetch", url_fetch)
+
+    good_url = "https://unittests.org/packages/a0/a0/a0a0/package-1.0.0.tar.gz"
+    missing_url = "https://unittests.org/packages/b0/b0/b0b0/package-2.0.0.tar.gz"
+    good_file = tmp_path / "web" / convert_url_to_path(good_url)
+    good_file.parent.mkdir(parents=True)
+    good_file.write_text("69")
+
+    jsonpath = tmp_path / "web" / "json"
+    jsonpath.mkdir(parents=True)
+    (jsonpath / "package").write_text(
+        json.dumps(
+            {
+                "info": {"name": "package"},
+                "releases": {
+                    "1.0.0": [
+                        {
+                            "url": good_url,
+                            "digests": {
+                                "sha256": "c75cb66ae28d8ebc6eded002c28a8ba0d06d3a78c6b5cbf9b2ade051f0775ac4"  # noqa: E501
+                            },
+                        }
+                    ],
+                    "2.0.0": [
+                        {
+                            "url": missing_url,
+                            "digests": {
+                                "sha256": "c3a3a8f5c5f5ac3df9cdbaca8b9b7b0c29fd9e5ac2a0d4c4a3b6e2a3f7ea0e21"  # noqa: E501
+                            },
+                        }
+                    ],
+                },
+            }
+        )
+    )
+    all_package_files = await verify(master, fc, "package", tmp_path, fa)  # type: ignore # noqa: E501
+    assert sorted(all_package_files) == sorted(
+        [good_file, tmp_path / "web" / convert_url_to_path(missing_url)]
+    )
+    # Missing file is fetched, then re-fetched after its sha256 mismatch
+    assert [c.args[0] for c in url_fetch.call_args_list] == [missing_url] * 2
+
+
+@pytest.mark.asyncio
+async def test_verify_refetch_error_is_deferred(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    class FakeArgs:
+        delete = True
+        dry_run = False
+        json_update = False
+        workers = 2
+
+    fa = FakeArgs()
+    fc = FakeConfig()
+
+    master = Master(fc.get("mirror", "master"))
+    url_fetch = AsyncMock(side_effect=ServerTimeoutError("timed out"))
+    monkeypatch.setattr(master, "url_fetch", url_fetch)
+    on_error_mock = mock.Mock()
+    monkeypatch.setattr(bandersnatch.verify, "on_error", on_error_mock)
+
+    url = "https://unittests.org/packages/a0/a0/a0a0/package-1.0.0.tar.gz"
+    corrupt_file = tmp_path / "web" / convert_url_to_path(url)
+    corrupt_file.parent.mkdir(parents=True)
+    corrupt_file.write_text("6")
+
+    jsonpath = tmp_path / "web" / "json"
+    jsonpath.mkdir(parents=True)
+    (jsonpath / "package").write_text(
+        json.dumps(
+            {
+                "info": {"name": "package"},
+                "releases": {"1.0.0": [{"url": url, "digests": {"sha256": "69"}}]},
+            }
+        )
+    )
+    all_package_files = await verify(master, fc, "package", tmp_path, fa)  # type: ignore # noqa: E501
+    assert not all_package_files
+    url_fetch.assert_called_once()
+    # The re-fetch error goes through on_error() like other download errors
+    on_error_mock.assert_called_once_with(
+        False, url_fetch.side_effect, package="package"
+    )
+
+
+@pytest.mark.asyncio
+async def test_verify_size_mismatch_skips_hash(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    class FakeArgs:
+        delete = True
+        dry_run = False
+        json_update = False
+        workers = 2
+
+    fa = FakeArgs()
+    fc = FakeConfig()
+
+    master = Master(fc.get("mirror", "master"))
+    url_fetch = AsyncMock(side_effect=fake_fetch)
+    monkeypatch.setattr(master, "url_fetch", url_fetch)
+    hash_mock = mock.Mock(side_effect=AssertionError("should not hash"))
+    monkeypatch.setattr(bandersnatch.verify, "hash", hash_mock)
+
+    url = "https://unittests.org/packages/a0/a0/a0a0/package-1.0.0.tar.gz"
+    truncated_file = tmp_path / "web" / convert_url_to_path(url)
+    truncated_file.parent.mkdir(parents=True)
+    truncated_file.write_text("6")
+
+    jsonpath = tmp_path / "web" / "json"
+    jsonpath.mkdir(parents=True)
+    (jsonpath / "package").write_text(
+        json.dumps(
+            {
+                "info": {"name": "package"},
+                "releases": {
+                    "1.0.0": [{"url": url, "size": 2, "digests": {"sha256": "69"}}]
+                },
+            }
+        )
+    )
+    all_package_files = await verify(master, fc, "package", tmp_path, fa)  # type: ignore # noqa: E501
+    assert all_package_files == [truncated_file]
+    assert not hash_mock.called
+    url_fetch.assert_called_once()
+    assert truncated_file.read_text() == "fake text"
+
+
+def test_hash_release_file_hashes_when_stat_fails(monkeypatch: MonkeyPatch) -> None:
+    hash_mock = mock.Mock(return_value="69")
+    monkeypatch.setattr(bandersnatch.verify, "hash", hash_mock)
+    pkg_file = mock.Mock()
+    pkg_file.stat.side_effect = FileNotFoundError
+
+    assert bandersnatch.verify.hash_release_file(pkg_file, 2) == "69"
+    hash_mock.assert_called_once_with(pkg_file)
+
+
 if __name__ == "__main__":
     pytest.main(sys.argv)
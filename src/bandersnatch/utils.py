@@ -37,6 +37,8 @@ def user_agent() -> str:
 SAFE_NAME_REGEX = re.compile(r"[^A-Za-z0-9.]+")
 USER_AGENT = user_agent()
 WINDOWS = bool(platform.system() == "Windows")
+# The concrete pathlib class of local paths on this platform
+LOCAL_PATH = type(Path())
 
 
 class StrEnum(str, Enum):
@@ -58,10 +60,31 @@ def convert_url_to_path(url: str) -> str:
     return urlparse(url).path[1:]
 
 
+def _fadvise(f: IO, advice: str) -> None:
+    """Pass a posix_fadvise() hint covering the whole file, if the platform and
+    file object (e.g. not a remote storage backend one) support it"""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(f.fileno(), 0, 0, getattr(os, advice))
+    except (AttributeError, OSError, ValueError):
+        pass
+
+
 def hash(path: Path, function: str = "sha256") -> str:
-    h = getattr(hashlib, function)
-    content = path.read_bytes()
-    result = h(content).hexdigest()
+    if type(path) is not LOCAL_PATH:
+        # Storage backend paths (e.g. SwiftPath) read their contents through
+        # the backend, but don't all override open(), which would then go to
+        # the local filesystem
+        h = getattr(hashlib, function)
+        result = h(path.read_bytes()).hexdigest()
+    else:
+        # file_digest runs the whole read + update loop in C and never holds
+        # the complete file in memory
+        with path.open("rb") as f:
+            # Files are read once front to back, so read ahead aggressively
+            _fadvise(f, "POSIX_FADV_SEQUENTIAL")
+            result = hashlib.file_digest(f, function).hexdigest()
     if isinstance(result, str):
         return result
     raise TypeError("hashlib did not return str")
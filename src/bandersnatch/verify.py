@@ -6,6 +6,7 @@ import logging
 import sys
 from argparse import Namespace
 from asyncio.queues import Queue
+from collections.abc import Collection
 from configparser import ConfigParser
 from pathlib import Path
 from sys import stderr
@@ -21,6 +22,12 @@ from .utils import convert_url_to_path, find_all_files, hash, unlink_parent_dir
 
 logger = logging.getLogger(__name__)
 
+# Bounds of the per JSON file fetch -> hash pipeline in verify()
+PIPELINE_QUEUE_SIZE = 32
+PIPELINE_WORKERS = 4
+# Number of unowned files each executor task deletes
+DELETE_BATCH_SIZE = 256
+
 
 def on_error(stop_on_error: bool, exception: BaseException, package: str) -> None:
     if isinstance(exception, KeyboardInterrupt):
@@ -73,10 +80,15 @@ async def get_latest_json(
             json_path.unlink()
 
 
+def unlink_files(paths: list[Path]) -> None:
+    for path in paths:
+        unlink_parent_dir(path)
+
+
 async def delete_unowned_files(
     mirror_base: Path,
     executor: concurrent.futures.ThreadPoolExecutor,
-    all_package_files: list[Path],
+    all_package_files: Collection[Path],
     dry_run: bool,
 ) -> int:
     loop = asyncio.get_event_loop()
@@ -84,10 +96,12 @@ async def delete_unowned_files(
     all_fs_files: set[Path] = set()
     await loop.run_in_executor(executor, find_all_files, all_fs_files, packages_path)
 
-    all_package_files_set = set(all_package_files)
-    unowned_files = all_fs_files - all_package_files_set
+    # Remove the owned files in place rather than building a second set holding
+    # every package file of the mirror just to diff against it
+    unowned_files = all_fs_files
+    unowned_files.difference_update(all_package_files)
     logger.info(
-        f"We have {len(all_package_files_set)} files. "
+        f"We have {len(all_package_files)} files. "
         + f"{len(unowned_files)} unowned files"
     )
     if not unowned_files:
@@ -99,29 +113,144 @@ async def delete_unowned_files(
         for f in sorted(unowned_files):
             print(f)
     else:
-        del_coros = []
-        for file_path in unowned_files:
-            del_coros.append(
-                loop.run_in_executor(executor, unlink_parent_dir, file_path)
+        # Hand the executor batches of files rather than one task per file
+        unowned = list(unowned_files)
+        del_coros = [
+            loop.run_in_executor(
+                executor, unlink_files, unowned[i : i + DELETE_BATCH_SIZE]
             )
+            for i in range(0, len(unowned), DELETE_BATCH_SIZE)
+        ]
         await asyncio.gather(*del_coros)
 
     return 0
 
 
+def hash_release_file(pkg_file: Path, expected_size: int | None) -> str | None:
+    """Return the sha256 of a release file, or None without reading it when its
+    size already shows it is truncated or otherwise corrupt. Files that can't be
+    stat()ed (e.g. on some storage backends) are always hashed"""
+    if expected_size is not None:
+        try:
+            if pkg_file.stat().st_size != expected_size:
+                return None
+        except (OSError, NotImplementedError):
+            pass
+    return hash(pkg_file)
+
+
+async def verify_release_files(
+    master: Master,
+    release_files: list[dict],
+    mirror_base_path: Path,
+    package_files: list[Path],
+    args: argparse.Namespace,
+    executor: concurrent.futures.ThreadPoolExecutor | None = None,
+    fetch_semaphore: asyncio.Semaphore | None = None,
+) -> Exception | None:
+    """Fetch missing release files and check the sha256 of all of them.
+    Returns the first download exception hit, if any, so the caller can decide
+    whether to stop"""
+    loop = asyncio.get_event_loop()
+    semaphore = fetch_semaphore or asyncio.Semaphore(PIPELINE_WORKERS)
+    deferred_exception: Exception | None = None
+    web_base = mirror_base_path / "web"
+    pkg_files = [web_base / convert_url_to_path(jpkg["url"]) for jpkg in release_files]
+    # Check which release files exist up front in the executor rather than
+    # stat()ing each of them on the event loop
+    existing_files = await loop.run_in_executor(
+        executor, lambda: {pkg_file for pkg_file in pkg_files if pkg_file.exists()}
+    )
+    fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    hash_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+
+    async def fetch(url: str, pkg_file: Path) -> None:
+        async with semaphore:
+            await master.url_fetch(url, pkg_file, executor)
+
+    async def fetch_consumer() -> None:
+        """Ensure each release file exists locally before handing it to hashing"""
+        nonlocal deferred_exception
+        while (item := await fetch_queue.get()) is not None:
+            jpkg, pkg_file = item
+            if pkg_file not in existing_files:
+                if args.dry_run:
+                    logger.info(f"{jpkg['url']} would be fetched")
+                    package_files.append(pkg_file)
+                    continue
+                else:
+                    try:
+                        await fetch(jpkg["url"], pkg_file)
+                    except Exception as e:
+                        logger.exception(
+                            "Continuing to next file after error downloading: "
+                            f"{jpkg['url']}"
+                        )
+                        if not deferred_exception:  # keep first exception
+                            deferred_exception = e
+                        continue
+            await hash_queue.put((jpkg, pkg_file))
+
+    async def hash_consumer() -> None:
+        """Check the sha256 of local release files, re-fetching on mismatch"""
+        nonlocal deferred_exception
+        while (item := await hash_queue.get()) is not None:
+            jpkg, pkg_file = item
+            # The size check is a syscall too, so it runs in the executor with
+            # the hashing rather than on the event loop
+            calc_sha256 = await loop.run_in_executor(
+                executor, hash_release_file, pkg_file, jpkg.get("size")
+            )
+            if calc_sha256 != jpkg["digests"]["sha256"]:
+                if not args.dry_run:
+                    await loop.run_in_executor(None, pkg_file.unlink)
+                    try:
+                        await fetch(jpkg["url"], pkg_file)
+                    except Exception as e:
+                        logger.exception(
+                            "Continuing to next file after error downloading: "
+                            f"{jpkg['url']}"
+                        )
+                        if not deferred_exception:  # keep first exception
+                            deferred_exception = e
+                        continue
+                else:
+                    logger.info(
+                        f"[DRY RUN] {jpkg['info']['name']} has a sha256 mismatch."
+                    )
+
+            package_files.append(pkg_file)
+
+    # Overlap downloads and hashing of different files: fetchers feed a bounded
+    # queue that the hashers drain, so neither the network nor the CPU sits idle
+    async with asyncio.TaskGroup() as tg:
+        fetchers = [tg.create_task(fetch_consumer()) for _ in range(PIPELINE_WORKERS)]
+        hashers = [tg.create_task(hash_consumer()) for _ in range(PIPELINE_WORKERS)]
+        for jpkg, pkg_file in zip(release_files, pkg_files):
+            await fetch_queue.put((jpkg, pkg_file))
+        for _ in fetchers:
+            await fetch_queue.put(None)
+        await asyncio.gather(*fetchers)
+        for _ in hashers:
+            await hash_queue.put(None)
+
+    return deferred_exception
+
+
 async def verify(
     master: Master,
     config: ConfigParser,
     json_file: str,
     mirror_base_path: Path,
-    all_package_files: list[Path],
     args: argparse.Namespace,
     executor: concurrent.futures.ThreadPoolExecutor | None = None,
     releases_key: str = "releases",
-) -> None:
+    fetch_semaphore: asyncio.Semaphore | None = None,
+) -> list[Path]:
+    """Verify the release files of a JSON metadata file, fetching missing or
+    corrupt ones. Returns the release files the JSON owns"""
     json_base = mirror_base_path / "web" / "json"
     json_full_path = json_base / json_file
-    loop = asyncio.get_event_loop()
     logger.info(f"Parsing {json_file}")
     stop_on_error = config.getboolean("mirror", "stop-on-error")
 
@@ -142,18 +271,18 @@ async def verify(
             "Skipping deleting JSON file due to keep_file attribute "
             f"being set {str(json_full_path)}"
         )
-        return
+        return []
 
     if not json_full_path.exists():
         logger.debug(f"Not trying to sync package as {json_full_path} does not exist")
-        return
+        return []
 
     try:
         with json_full_path.open("r") as jfp:
             pkg = json.load(jfp)
     except json.decoder.JSONDecodeError as jde:
         logger.error(f"Failed to load {json_full_path}: {jde} - skipping ...")
-        return
+        return []
 
     # apply releases filter plugins like class Package
     pkg_c = Package(pkg["info"]["name"])
@@ -163,54 +292,41 @@ async def verify(
     pkg.filter_all_releases_files(LoadedFilters().filter_release_file_plugins())
     pkg.filter_all_releases(LoadedFilters().filter_release_plugins())
 
-    deferred_exception = None
-    for release_version in pkg.releases:
-        for jpkg in pkg.releases[release_version]:
-            pkg_file = mirror_base_path / "web" / convert_url_to_path(jpkg["url"])
-            if not pkg_file.exists():
-                if args.dry_run:
-                    logger.info(f"{jpkg['url']} would be fetched")
-                    all_package_files.append(pkg_file)
-                    continue
-                else:
-                    try:
-                        await master.url_fetch(jpkg["url"], pkg_file, executor)
-                    except Exception as e:
-                        logger.exception(
-                            "Continuing to next file after error downloading: "
-                            f"{jpkg['url']}"
-                        )
-                        if not deferred_exception:  # keep first exception
-                            deferred_exception = e
-                        continue
-
-            calc_sha256 = await loop.run_in_executor(executor, hash, pkg_file)
-            if calc_sha256 != jpkg["digests"]["sha256"]:
-                if not args.dry_run:
-                    await loop.run_in_executor(None, pkg_file.unlink)
-                    await master.url_fetch(jpkg["url"], pkg_file, executor)
-                else:
-                    logger.info(
-                        f"[DRY RUN] {jpkg['info']['name']} has a sha256 mismatch."
-                    )
-
-            all_package_files.append(pkg_file)
-
+    release_files = pkg.release_files
+    # Only the release file entries are needed from here on. Drop the rest of the
+    # metadata (descriptions, filtered out releases ...) so many concurrent
+    # verifiers don't all hold their whole JSON while fetching and hashing
+    del pkg, pkg_c
+    package_files: list[Path] = []
+    deferred_exception = await verify_release_files(
+        master,
+        release_files,
+        mirror_base_path,
+        package_files,
+        args,
+        executor,
+        fetch_semaphore,
+    )
     if deferred_exception:
         on_error(stop_on_error, deferred_exception, package=json_file)
 
     logger.info(f"Finished validating {json_file}")
+    return package_files
 
 
 async def verify_producer(
     master: Master,
     config: ConfigParser,
-    all_package_files: list[Path],
     mirror_base_path: Path,
     json_files: list[str],
     args: argparse.Namespace,
     executor: concurrent.futures.ThreadPoolExecutor | None = None,
-) -> None:
+    fetch_semaphore: asyncio.Semaphore | None = None,
+) -> set[Path]:
+    """Verify all json_files, returning every release file they own"""
+    # Each verify collects its own files, merged once at the end rather than
+    # every coroutine appending to one shared list
+    package_files_lists: list[list[Path]] = []
     queue: asyncio.Queue = asyncio.Queue()
     for jf in json_files:
         await queue.put(jf)
@@ -218,25 +334,25 @@ async def verify_producer(
     async def consume(q: Queue) -> None:
         while not q.empty():
             json_file = await q.get()
-            await verify(
+            package_files = await verify(
                 master,
                 config,
                 json_file,
                 mirror_base_path,
-                all_package_files,
                 args,
                 executor,
+                fetch_semaphore=fetch_semaphore,
             )
+            package_files_lists.append(package_files)
 
-    await asyncio.gather(
-        *[consume(queue)] * config.getint("mirror", "verifiers", fallback=3)
-    )
+    verifiers = config.getint("mirror", "verifiers", fallback=3)
+    await asyncio.gather(*[consume(queue) for _ in range(verifiers)])
+    return set().union(*package_files_lists)
 
 
 async def metadata_verify(config: ConfigParser, args: Namespace) -> int:
     """Crawl all saved JSON metadata or online to check we have all packages
     if delete - generate a diff of unowned files"""
-    all_package_files: list[Path] = []
 
     storage_backend = next(
         iter(
@@ -265,19 +381,21 @@ async def metadata_verify(config: ConfigParser, args: Namespace) -> int:
 
     logger.debug(f"Found {len(json_files)} objects in {json_base}")
     logger.debug(f"Using a {workers} thread ThreadPoolExecutor")
+    # Bound the downloads in flight across all verifiers
+    fetch_semaphore = asyncio.Semaphore(workers * 2)
     async with Master(
         config.get("mirror", "master"),
         config.getfloat("mirror", "timeout"),
         config.getfloat("mirror", "global-timeout", fallback=None),
     ) as master:
-        await verify_producer(
+        all_package_files = await verify_producer(
             master,
             config,
-            all_package_files,
             mirror_base_path,
             json_files,
             args,
             executor,
+            fetch_semaphore,
         )
 
     if not args.delete:
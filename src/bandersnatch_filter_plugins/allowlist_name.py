@@ -1,5 +1,7 @@
 import logging
+import re
 from collections.abc import Iterator
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
@@ -7,25 +9,36 @@ if TYPE_CHECKING:
     from configparser import SectionProxy
 
 from packaging.requirements import Requirement
-from packaging.utils import canonicalize_name
-from packaging.version import InvalidVersion, Version
+from packaging.specifiers import SpecifierSet
+from packaging.version import InvalidVersion
 
 from bandersnatch.filter import FilterProjectPlugin, FilterReleasePlugin
 
+from .caching import cached_version, canonical_name
 from .encoding import auto_decode
 
 logger = logging.getLogger("bandersnatch")
 
+# Everything up to an (inline) comment, without the surrounding whitespace, for
+# each line of a multi-line string
+_LINE_RE = re.compile(r"^[^\S\n]*([^#\s][^#\n]*?)[^\S\n]*(?:#.*)?$", re.MULTILINE)
+
 
 class AllowListProject(FilterProjectPlugin):
     name = "allowlist_project"
     # Requires iterable default
-    allowlist_package_names: list[str] = []
+    allowlist_package_names: frozenset[str] = frozenset()
+    initialized = False
+    _enabled: bool = False
 
     def initialize_plugin(self) -> None:
         """
         Initialize the plugin
         """
+        # Running this again (e.g. for an empty allowlist) would only parse the
+        # same configuration once more
+        if self.initialized:
+            return
         # Generate a list of allowlisted packages from the configuration and
         # store it into self.allowlist_package_names attribute so this
         # operation doesn't end up in the fastpath.
@@ -35,36 +48,31 @@ class AllowListProject(FilterProjectPlugin):
                 f"Initialized project plugin {self.name}, filtering "
                 + f"{self.allowlist_package_names}"
             )
+        self._enabled = bool(self.allowlist_package_names)
+        self.initialized = True
 
-    def _determine_unfiltered_package_names(self) -> list[str]:
+    def _determine_unfiltered_package_names(self) -> frozenset[str]:
         """
-        Return a list of package names to be filtered base on the configuration
+        Return a set of package names to be filtered base on the configuration
         file.
         """
         # This plugin only processes packages, if the line in the packages
         # configuration contains a PEP440 specifier it will be processed by the
         # allowlist release filter.  So we need to remove any packages that
         # are not applicable for this plugin.
-        unfiltered_packages: set[str] = set()
         try:
             lines = self.allowlist["packages"]
-            package_lines = lines.split("\n")
         except KeyError:
-            package_lines = []
-        for package_line in package_lines:
-            package_line = package_line.strip()
-            if not package_line or package_line.startswith("#"):
-                continue
-            package_line, *_ = package_line.split("#", maxsplit=1)
-            unfiltered_packages.add(
-                canonicalize_name(Requirement(package_line.strip()).name)
-            )
-        return list(unfiltered_packages)
+            lines = ""
+        return _parse_project_lines(lines)
 
     def filter(self, metadata: dict) -> bool:
-        return not self.check_match(name=metadata["info"]["name"])
+        # An empty allowlist lets every project through
+        if not self._enabled:
+            return True
+        return not self.check_match(metadata["info"]["name"])
 
-    def check_match(self, **kwargs: Any) -> bool:
+    def check_match(self, name: str | None = None, **kwargs: Any) -> bool:
         """
         Check if the package name matches against a project that is allowlisted
         in the configuration.
@@ -80,19 +88,22 @@ class AllowListProject(FilterProjectPlugin):
         bool:
             True if it matches, False otherwise.
         """
-        if not self.allowlist_package_names:
+        if not self.allowlist_package_names or not name:
             return False
 
-        name = kwargs.get("name", None)
-        if not name:
-            return False
-
-        if canonicalize_name(name) in self.allowlist_package_names:
-            logger.info(f"Package {name!r} is allowlisted")
+        if canonical_name(name) in self.allowlist_package_names:
+            logger.info("Package %r is allowlisted", name)
             return False
         return True
 
 
+def _strip_comments(lines: str) -> Iterator[str]:
+    """Yield the content of every line that isn't blank or a comment, with
+    inline comments and surrounding whitespace removed"""
+    for match in _LINE_RE.finditer(lines):
+        yield match.group(1)
+
+
 def get_requirement_files(allowlist: "SectionProxy") -> Iterator[Path]:
     try:
         requirements_path = Path(allowlist["requirements_path"])
@@ -101,87 +112,129 @@ def get_requirement_files(allowlist: "SectionProxy") -> Iterator[Path]:
 
     try:
         lines = allowlist["requirements"]
-        requirements_lines = lines.split("\n")
     except KeyError:
-        requirements_lines = []
-
-    for requirement_line in requirements_lines:
-        requirement_line = requirement_line.strip()
-        if not requirement_line or requirement_line.startswith("#"):
-            continue
-        requirement_line, *_ = requirement_line.split("#", maxsplit=1)
-        if requirement_line.strip().find("*") >= 0:
-            files = sorted(requirements_path.glob(requirement_line.strip()))
-            for file in files:
-                requirement = file.name
-                logger.info("considering %s", requirements_path / requirement)
-                yield requirements_path / requirement
+        lines = ""
+
+    for requirement in _strip_comments(lines):
+        if "*" in requirement:
+            # glob() already yields paths under requirements_path, use them as is
+            files = sorted(requirements_path.glob(requirement))
+            # Log a whole expansion at once, globs can match a lot of files
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "considering %d files matching %s: %s",
+                    len(files),
+                    requirements_path / requirement,
+                    ", ".join(str(file) for file in files),
+                )
+            yield from files
         else:
-            requirement = requirement_line.strip()
-            logger.info("considering %s", requirements_path / requirement)
-            yield requirements_path / requirement
+            file = requirements_path / requirement
+            logger.info("considering %s", file)
+            yield file
+
+
+def _read_text(filepath: Path) -> str:
+    """Read a whole requirements file with a single read and decode it"""
+    return auto_decode(filepath.read_bytes())
+
+
+@lru_cache(maxsize=32768)
+def _requirement_name(line: str) -> str:
+    """The canonical project name of a single requirement
+
+    The project plugins commonly read the same lines over and over. Only the
+    (immutable) name is cached, never the Requirement objects, which can be
+    modified and so must not be shared between plugins.
+    """
+    return canonical_name(Requirement(line).name)
+
 
+def _parse_requirement(line: str) -> Requirement:
+    """Parse a single requirement, normalizing its name and allowing
+    prereleases"""
+    requirement = Requirement(line)
+    requirement.name = canonical_name(requirement.name)
+    requirement.specifier.prereleases = True
+    return requirement
 
-def _parse_package_lines(package_lines: list[str]) -> set[Requirement]:
-    """Parse a requirement line
 
-    ignores commented line
-    and inline comments
+def _parse_package_lines(package_lines: str) -> set[Requirement]:
+    """Parse requirement lines into requirements
+
+    ignores commented line, inline comments and options
+    """
+    # A comprehension adds to the set without looking up and calling .add()
+    # for every line. _strip_comments never yields empty lines, so checking
+    # the first character for options (-r, -e, ...) is safe
+    return {
+        _parse_requirement(package_line)
+        for package_line in _strip_comments(package_lines)
+        if package_line[0] != "-"
+    }
+
+
+def _parse_project_lines(package_lines: str) -> frozenset[str]:
+    """Parse requirement lines into the canonical names of their projects
+
+    ignores commented line, inline comments and options
     """
-    filtered_requirements: set[Requirement] = set()
-    for package_line in package_lines:
-        package_line = package_line.strip()
-        if not package_line or package_line.startswith(("#", "-")):
-            continue
-        package_line, *_ = package_line.split("#", maxsplit=1)
-        requirement = Requirement(package_line.strip())
-        requirement.name = canonicalize_name(requirement.name)
-        requirement.specifier.prereleases = True
-        filtered_requirements.add(requirement)
-    return filtered_requirements
+    return frozenset(
+        _requirement_name(package_line)
+        for package_line in _strip_comments(package_lines)
+        if package_line[0] != "-"
+    )
 
 
 class AllowListRequirements(AllowListProject):
     name = "project_requirements"
 
-    def _determine_unfiltered_package_names(self) -> list[str]:
+    def _determine_unfiltered_package_names(self) -> frozenset[str]:
         """
-        Return a list of package names to be filtered base on the configuration
+        Return a set of package names to be filtered base on the configuration
         file.
         """
-        filtered_requirements: set[Requirement] = set()
+        unfiltered_packages: set[str] = set()
         try:
             filepaths = get_requirement_files(self.allowlist)
         except KeyError:
-            return []
+            return frozenset()
 
         for filepath in filepaths:
-            with open(filepath, "rb") as req_fh:
-                content = auto_decode(req_fh.read())
-                filtered_requirements |= _parse_package_lines(content.splitlines())
-        return list(req.name for req in filtered_requirements)
+            unfiltered_packages |= _parse_project_lines(_read_text(filepath))
+        return frozenset(unfiltered_packages)
 
 
 class AllowListRelease(FilterReleasePlugin):
     name = "allowlist_release"
-    # Requires iterable default
-    allowlist_package_names: list[Requirement] = []
+    initialized = False
+    _enabled: bool = False
 
     def initialize_plugin(self) -> None:
         """
         Initialize the plugin
         """
         # Generate a list of allowlisted packages from the configuration and
-        # store it into self.allowlist_package_names attribute so this
+        # store it into self.allowlist_release_requirements attribute so this
         # operation doesn't end up in the fastpath.
-        if not self.allowlist_package_names:
+        if not self.initialized:
             self.allowlist_release_requirements = (
                 self._determine_filtered_package_requirements()
             )
+            # Group the specifiers by (canonical) project name so the fastpath
+            # only looks at the requirements of the project being filtered,
+            # along with whether they pin anything at all
+            self._specifiers_by_name: dict[str, list[tuple[bool, SpecifierSet]]] = {}
+            for requirement in self.allowlist_release_requirements:
+                self._specifiers_by_name.setdefault(requirement.name, []).append(
+                    (len(requirement.specifier) > 0, requirement.specifier)
+                )
             logger.info(
                 f"Initialized release plugin {self.name}, filtering "
                 + f"{self.allowlist_release_requirements}"
             )
+            self._enabled = bool(self._specifiers_by_name)
+            self.initialized = True
 
     def _determine_filtered_package_requirements(self) -> list[Requirement]:
         """
@@ -197,27 +250,24 @@ class AllowListRelease(FilterReleasePlugin):
         """
         try:
             lines = self.allowlist["packages"]
-            package_lines = lines.split("\n")
         except KeyError:
-            package_lines = []
-        return list(_parse_package_lines(package_lines))
+            lines = ""
+        return list(_parse_package_lines(lines))
 
     def pinned_version_exists(self, metadata: dict) -> bool:
-        name = canonicalize_name(metadata["info"]["name"])
-        for requirement in self.allowlist_release_requirements:
-            if name != requirement.name:
-                continue
-            return len(requirement.specifier) > 0
-        return False
+        name = canonical_name(metadata["info"]["name"])
+        return any(has_pins for has_pins, _ in self._specifiers_by_name.get(name, ()))
 
     def filter(self, metadata: dict) -> bool:
         """
         Returns False if version fails the filter,
         i.e. doesn't matches an allowlist version specifier
         """
-        name = metadata["info"]["name"]
-        version = metadata["version"]
-        return self._check_match(canonicalize_name(name), version)
+        # No release can match an empty allowlist
+        if not self._enabled:
+            return False
+        info = metadata["info"]
+        return self._check_match(canonical_name(info["name"]), metadata["version"])
 
     def _check_match(self, name: str, version_string: str) -> bool:
         """
@@ -240,18 +290,24 @@ class AllowListRelease(FilterReleasePlugin):
         if not name or not version_string:
             return False
 
+        # Releases of projects that aren't allowlisted never need their
+        # version parsed
+        specifiers = self._specifiers_by_name.get(name)
+        if not specifiers:
+            return False
+
         try:
-            version = Version(version_string)
+            version = cached_version(version_string)
         except InvalidVersion:
-            logger.debug(f"Package {name}=={version_string} has an invalid version")
+            logger.debug("Package %s==%s has an invalid version", name, version_string)
             return False
-        for requirement in self.allowlist_release_requirements:
-            if name != requirement.name:
-                continue
-            if version in requirement.specifier:
+        for _, specifier in specifiers:
+            if version in specifier:
                 logger.debug(
-                    f"MATCH: Release {name}=={version} matches specifier "
-                    f"{requirement.specifier}"
+                    "MATCH: Release %s==%s matches specifier %s",
+                    name,
+                    version,
+                    specifier,
                 )
                 return True
         return False
@@ -280,6 +336,5 @@ class AllowListRequirementsPinned(AllowListRelease):
         except KeyError:
             return []
         for filepath in filepaths:
-            with open(filepath) as req_fh:
-                filtered_requirements |= _parse_package_lines(req_fh.readlines())
+            filtered_requirements |= _parse_package_lines(_read_text(filepath))
         return list(filtered_requirements)
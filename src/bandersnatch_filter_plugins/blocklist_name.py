@@ -1,24 +1,88 @@
 import logging
+import re
+from functools import lru_cache
 from typing import Any
 
 from packaging.requirements import Requirement
-from packaging.utils import canonicalize_name
+from packaging.specifiers import SpecifierSet
 from packaging.version import InvalidVersion, Version
 
 from bandersnatch.filter import FilterProjectPlugin, FilterReleasePlugin
 
+from .caching import cached_version, canonical_name
+
 logger = logging.getLogger("bandersnatch")
 
+# Every line that isn't blank or a comment, without the surrounding whitespace
+_LINE_RE = re.compile(r"^[^\S\n]*([^#\s][^\n]*?)[^\S\n]*$", re.MULTILINE)
+
+
+def _parse_package_lines(lines: str) -> list[Requirement]:
+    """Parse every line of the blocklist packages configuration into a
+    requirement with a canonical name that matches prereleases
+
+    Requirement objects can be modified, so each plugin gets its own.
+    """
+    filtered_requirements: set[Requirement] = set()
+    for package_line in _LINE_RE.findall(lines):
+        requirement = Requirement(package_line)
+        requirement.name = canonical_name(requirement.name)
+        requirement.specifier.prereleases = True
+        filtered_requirements.add(requirement)
+    return list(filtered_requirements)
+
+
+@lru_cache(maxsize=16)
+def _parse_project_lines(lines: str) -> frozenset[str]:
+    """Parse the blocklist packages configuration into the canonical names of
+    the projects that are blocked as a whole, i.e. lines without a PEP440
+    specifier
+
+    Every plugin instance reads the same configuration, so this is cached. The
+    result is immutable and safe to share.
+    """
+    filtered_packages: set[str] = set()
+    for package_line in _LINE_RE.findall(lines):
+        requirement = Requirement(package_line)
+        if requirement.specifier:
+            continue
+        if requirement.name == package_line:
+            filtered_packages.add(canonical_name(requirement.name))
+        else:
+            logger.debug(
+                "Package line %r does not match requirement name %r",
+                package_line,
+                requirement.name,
+            )
+    return frozenset(filtered_packages)
+
+
+def _exact_pin(specifier: SpecifierSet) -> Version | None:
+    """Return the version a specifier consisting of a single ==X clause
+    pins, None for anything else"""
+    if len(specifier) != 1:
+        return None
+    (clause,) = specifier
+    if clause.operator != "==" or clause.version.endswith(".*"):
+        return None
+    return cached_version(clause.version)
+
 
 class BlockListProject(FilterProjectPlugin):
     name = "blocklist_project"
     # Requires iterable default
-    blocklist_package_names: list[str] = []
+    blocklist_package_names: frozenset[str] = frozenset()
+    initialized = False
+    _enabled: bool = False
 
     def initialize_plugin(self) -> None:
         """
         Initialize the plugin
         """
+        # Running this again (e.g. for an empty blocklist) would only parse the
+        # same configuration once more
+        if self.initialized:
+            return
         # Generate a list of blocklisted packages from the configuration and
         # store it into self.blocklist_package_names attribute so this
         # operation doesn't end up in the fastpath.
@@ -28,44 +92,33 @@ class BlockListProject(FilterProjectPlugin):
                 f"Initialized project plugin {self.name}, filtering "
                 + f"{self.blocklist_package_names}"
             )
+        self._enabled = bool(self.blocklist_package_names)
+        self.initialized = True
 
-    def _determine_filtered_package_names(self) -> list[str]:
+    def _determine_filtered_package_names(self) -> frozenset[str]:
         """
-        Return a list of package names to be filtered base on the configuration
+        Return a set of package names to be filtered base on the configuration
         file.
         """
         # This plugin only processes packages, if the line in the packages
         # configuration contains a PEP440 specifier it will be processed by the
         # blocklist release filter.  So we need to remove any packages that
         # are not applicable for this plugin.
-        filtered_packages: set[str] = set()
         try:
             lines = self.blocklist["packages"]
-            package_lines = lines.split("\n")
         except KeyError:
-            package_lines = []
-        for package_line in package_lines:
-            package_line = package_line.strip()
-            if not package_line or package_line.startswith("#"):
-                continue
-            package_requirement = Requirement(package_line)
-            if package_requirement.specifier:
-                continue
-            if package_requirement.name != package_line:
-                logger.debug(
-                    "Package line %r does not match requirement name %r",
-                    package_line,
-                    package_requirement.name,
-                )
-                continue
-            filtered_packages.add(canonicalize_name(package_requirement.name))
+            lines = ""
+        filtered_packages = _parse_project_lines(lines)
         logger.debug("Project blocklist is %r", list(filtered_packages))
-        return list(filtered_packages)
+        return filtered_packages
 
     def filter(self, metadata: dict) -> bool:
-        return not self.check_match(name=metadata["info"]["name"])
+        # An empty blocklist lets every project through
+        if not self._enabled:
+            return True
+        return not self.check_match(metadata["info"]["name"])
 
-    def check_match(self, **kwargs: Any) -> bool:
+    def check_match(self, name: str | None = None, **kwargs: Any) -> bool:
         """
         Check if the package name matches against a project that is blocklisted
         in the configuration.
@@ -81,36 +134,56 @@ class BlockListProject(FilterProjectPlugin):
         bool:
             True if it matches, False otherwise.
         """
-        name = kwargs.get("name", None)
         if not name:
             return False
 
-        if canonicalize_name(name) in self.blocklist_package_names:
-            logger.info(f"Package {name!r} is blocklisted")
+        if canonical_name(name) in self.blocklist_package_names:
+            logger.info("Package %r is blocklisted", name)
             return True
         return False
 
 
 class BlockListRelease(FilterReleasePlugin):
     name = "blocklist_release"
-    # Requires iterable default
-    blocklist_package_names: list[Requirement] = []
+    initialized = False
+    _enabled: bool = False
 
     def initialize_plugin(self) -> None:
         """
         Initialize the plugin
         """
         # Generate a list of blocklisted packages from the configuration and
-        # store it into self.blocklist_package_names attribute so this
+        # store it into self.blocklist_release_requirements attribute so this
         # operation doesn't end up in the fastpath.
-        if not self.blocklist_package_names:
+        if not self.initialized:
             self.blocklist_release_requirements = (
                 self._determine_filtered_package_requirements()
             )
+            # Group the specifiers by (canonical) project name so the fastpath
+            # only looks at the requirements of the project being filtered.
+            # Exact pins (blocklists often enumerate single bad versions) go
+            # in a set so they are all checked with one lookup.
+            self._specifiers_by_name: dict[str, list[SpecifierSet]] = {}
+            self._exact_pins: dict[str, set[Version]] = {}
+            for requirement in self.blocklist_release_requirements:
+                pin = _exact_pin(requirement.specifier)
+                if pin is not None:
+                    self._exact_pins.setdefault(requirement.name, set()).add(pin)
+                else:
+                    self._specifiers_by_name.setdefault(requirement.name, []).append(
+                        requirement.specifier
+                    )
+            # Check the specifiers with the fewest clauses first: they are the
+            # cheapest to evaluate and the most likely to match, an empty one
+            # (blocking the whole project) matches every release
+            for specifiers in self._specifiers_by_name.values():
+                specifiers.sort(key=len)
             logger.info(
                 f"Initialized release plugin {self.name}, filtering "
                 + f"{self.blocklist_release_requirements}"
             )
+            self._enabled = bool(self._specifiers_by_name or self._exact_pins)
+            self.initialized = True
 
     def _determine_filtered_package_requirements(self) -> list[Requirement]:
         """
@@ -121,30 +194,23 @@ class BlockListRelease(FilterReleasePlugin):
         list of packaging.requirements.Requirement
             For all PEP440 package specifiers
         """
-        filtered_requirements: set[Requirement] = set()
         try:
             lines = self.blocklist["packages"]
-            package_lines = lines.split("\n")
         except KeyError:
-            package_lines = []
-        for package_line in package_lines:
-            package_line = package_line.strip()
-            if not package_line or package_line.startswith("#"):
-                continue
-            requirement = Requirement(package_line)
-            requirement.name = canonicalize_name(requirement.name)
-            requirement.specifier.prereleases = True
-            filtered_requirements.add(requirement)
-        return list(filtered_requirements)
+            lines = ""
+        return _parse_package_lines(lines)
 
     def filter(self, metadata: dict) -> bool:
         """
         Returns False if version fails the filter,
         i.e. matches a blocklist version specifier
         """
+        # An empty blocklist lets every release through
+        if not self._enabled:
+            return True
         name = metadata["info"]["name"]
         version = metadata["version"]
-        return not self._check_match(canonicalize_name(name), version)
+        return not self._check_match(canonical_name(name), version)
 
     def _check_match(self, name: str, version_string: str) -> bool:
         """
@@ -167,18 +233,34 @@ class BlockListRelease(FilterReleasePlugin):
         if not name or not version_string:
             return False
 
+        # Most releases belong to projects that aren't blocklisted at all,
+        # reject those before their version gets parsed
+        pins = self._exact_pins.get(name)
+        specifiers = self._specifiers_by_name.get(name)
+        if not pins and not specifiers:
+            return False
+
         try:
-            version = Version(version_string)
+            version = cached_version(version_string)
         except InvalidVersion:
-            logger.debug(f"Package {name}=={version_string} has an invalid version")
+            logger.debug("Package %s==%s has an invalid version", name, version_string)
             return False
-        for requirement in self.blocklist_release_requirements:
-            if name != requirement.name:
-                continue
-            if version in requirement.specifier:
+        if pins and (
+            version in pins
+            # ==X also matches X with any local version label
+            or (version.local and cached_version(version.public) in pins)
+        ):
+            logger.debug("MATCH: Release %s==%s is pinned", name, version)
+            return True
+        for specifier in specifiers or ():
+            # Blocklisted specifiers always match prereleases, say so up front
+            # instead of having the specifier work out its prerelease policy
+            if specifier.contains(version, prereleases=True):
                 logger.debug(
-                    f"MATCH: Release {name}=={version} matches specifier "
-                    f"{requirement.specifier}"
+                    "MATCH: Release %s==%s matches specifier %s",
+                    name,
+                    version,
+                    specifier,
                 )
                 return True
         return False
@@ -0,0 +1,32 @@
+"""
+Memoized packaging helpers shared by the filter plugins
+"""
+
+import sys
+from functools import lru_cache
+
+from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
+from packaging.version import Version
+
+
+# A project's name is canonicalized by every enabled plugin and for every one
+# of its releases, and the configured allow/block lists are parsed again for
+# each new set of plugins. The repeats are among the projects being worked on
+# and the configured names, not across all of PyPI, so a cache of this size
+# catches them without keeping every name seen during a sync.
+@lru_cache(maxsize=16384)
+def canonical_name(name: str) -> str:
+    # Interned, so a name looked up in a set or dict of configured names is
+    # the very same object and matches on the identity check alone
+    return sys.intern(canonicalize_name(name))
+
+
+# Parsed versions are a lot larger than strings, around 700 bytes per cache
+# entry, so only keep the most common ones ("1.0", "0.1.0", ...) around. That
+# bounds the cache to roughly 10MB for the lifetime of the process.
+cached_version = lru_cache(maxsize=16384)(Version)
+
+# Specifiers (e.g. requires_python values) are far fewer, but repeated across
+# many projects just the same
+cached_specifier_set = lru_cache(maxsize=4096)(SpecifierSet)
@@ -1,4 +1,6 @@
 import logging
+import re
+from collections.abc import Sequence
 
 from bandersnatch.filter import FilterReleaseFilePlugin
 from bandersnatch.utils import parse_version
@@ -12,11 +14,18 @@ class ExcludePlatformFilter(FilterReleaseFilePlugin):
     """
 
     name = "exclude_platform"
-
-    _patterns: list[str] = []
-    _packagetypes: list[str] = []
-
-    _pythonversions = [
+    initialized = False
+
+    # Set per instance by initialize_plugin(), the defaults are immutable so
+    # that instances can't end up extending a list shared by the class
+    _patterns: Sequence[str] = ()
+    _packagetypes: Sequence[str] = ()
+    # All of _patterns as a single alternation, matched in one pass
+    _patterns_re: re.Pattern | None = None
+    # Verdict of _check_match() for the package types it decides on alone
+    _packagetype_verdicts: dict[str, bool] = {"sdist": False}
+
+    _pythonversions = (
         "py2",
         "py2.4",
         "py2.5",
@@ -36,11 +45,11 @@ class ExcludePlatformFilter(FilterReleaseFilePlugin):
         "py3.10",
         "py3.11",
         "py3.12",
-    ]
+    )
 
-    _windowsPlatformTypes = [".win32", "-win32", "win_amd64", "win-amd64"]
+    _windowsPlatformTypes = (".win32", "-win32", "win_amd64", "win-amd64")
 
-    _linuxPlatformTypes = [
+    _linuxPlatformTypes = (
         "linux-i686",  # PEP 425
         "linux-x86_64",  # PEP 425
         "linux_armv7l",  # https://github.com/pypa/warehouse/pull/2010
@@ -56,16 +65,29 @@ class ExcludePlatformFilter(FilterReleaseFilePlugin):
         "manylinux2014_ppc64",  # PEP 599
         "manylinux2014_ppc64le",  # PEP 599
         "manylinux2014_s390x",  # PEP 599
-    ]
+    )
+
+    # Platform names mapped to the filename patterns and package types they
+    # exclude
+    _platformExclusions: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+        # PEP 425 (see also setuptools/package_index.py) and PEP 527
+        "windows": (_windowsPlatformTypes, ("bdist_msi", "bdist_wininst")),
+        "win": (_windowsPlatformTypes, ("bdist_msi", "bdist_wininst")),
+        "macos": (("macosx_", "macosx-"), ("bdist_dmg",)),
+        "macosx": (("macosx_", "macosx-"), ("bdist_dmg",)),
+        # concerns only very few files
+        "freebsd": ((".freebsd", "-freebsd"), ()),
+        "linux": (_linuxPlatformTypes, ("bdist_rpm",)),
+    }
 
     def initialize_plugin(self) -> None:
         """
         Initialize the plugin reading patterns from the config.
         """
-        if self._patterns or self._packagetypes:
+        if self.initialized:
             logger.debug(
                 "Skipping initialization of Exclude Platform plugin. "
-                + "Already initialized"
+                "Already initialized"
             )
             return
 
@@ -75,27 +97,16 @@ class ExcludePlatformFilter(FilterReleaseFilePlugin):
             logger.error(f"Plugin {self.name}: missing platforms= setting")
             return
 
+        self._patterns = []
+        self._packagetypes = []
         for platform in tags:
             lplatform = platform.lower()
+            exclusions = self._platformExclusions.get(lplatform)
 
-            if lplatform in ("windows", "win"):
-                # PEP 425
-                # see also setuptools/package_index.py
-                self._patterns.extend(self._windowsPlatformTypes)
-                # PEP 527
-                self._packagetypes.extend(["bdist_msi", "bdist_wininst"])
-
-            elif lplatform in ("macos", "macosx"):
-                self._patterns.extend(["macosx_", "macosx-"])
-                self._packagetypes.extend(["bdist_dmg"])
-
-            elif lplatform in ("freebsd"):
-                # concerns only very few files
-                self._patterns.extend([".freebsd", "-freebsd"])
-
-            elif lplatform in ("linux"):
-                self._patterns.extend(self._linuxPlatformTypes)
-                self._packagetypes.extend(["bdist_rpm"])
+            if exclusions is not None:
+                patterns, packagetypes = exclusions
+                self._patterns.extend(patterns)
+                self._packagetypes.extend(packagetypes)
 
             elif lplatform in self._pythonversions:
                 lversion = lplatform
@@ -103,12 +114,33 @@ class ExcludePlatformFilter(FilterReleaseFilePlugin):
 
             # check for platform specific architectures
             elif lplatform in self._windowsPlatformTypes:
-                self._patterns.extend([lplatform])
+                self._patterns.append(lplatform)
 
             elif lplatform in self._linuxPlatformTypes:
-                self._patterns.extend([lplatform])
+                self._patterns.append(lplatform)
+
+        self._compile_patterns()
+        self.initialized = True
+        # Every LoadedFilters() initializes its own instance (verify creates
+        # them for each project), so this would be repeated a lot at INFO
+        logger.debug(f"Initialized {self.name} plugin with {self._patterns!r}")
 
-        logger.info(f"Initialized {self.name} plugin with {self._patterns!r}")
+    def _compile_patterns(self) -> None:
+        """
+        Combine the (deduplicated) filename patterns into one regex so
+        _check_match() tests a filename against all of them in a single scan,
+        and map package types straight to their verdict
+        """
+        patterns = dict.fromkeys(self._patterns)
+        if patterns:
+            self._patterns_re = re.compile("|".join(map(re.escape, patterns)))
+        else:
+            self._patterns_re = None
+        # source dists are never filtered out, whatever else is configured
+        self._packagetype_verdicts = {
+            **dict.fromkeys(self._packagetypes, True),
+            "sdist": False,
+        }
 
     def filter(self, metadata: dict) -> bool:
         """
@@ -132,18 +164,11 @@ class ExcludePlatformFilter(FilterReleaseFilePlugin):
             True if it matches, False otherwise.
         """
 
-        # source dist: never filter out
-        pt = file_desc.get("packagetype")
-        if pt == "sdist":
-            return False
-
-        # Windows installer
-        if pt in self._packagetypes:
-            return True
-
-        fn = file_desc["filename"]
-        for i in self._patterns:
-            if i in fn:
-                return True
+        # source dist: never filter out, Windows installer etc.: always
+        verdict = self._packagetype_verdicts.get(file_desc.get("packagetype", ""))
+        if verdict is not None:
+            return verdict
 
-        return False
+        if self._patterns_re is None:
+            return False
+        return self._patterns_re.search(file_desc["filename"]) is not None
@@ -1,11 +1,10 @@
+import heapq
 import logging
-from collections.abc import Iterator
-from operator import itemgetter
-
-from packaging.version import Version, parse
 
 from bandersnatch.filter import FilterReleasePlugin
 
+from .caching import cached_version
+
 logger = logging.getLogger("bandersnatch")
 
 
@@ -18,6 +17,8 @@ class LatestReleaseFilter(FilterReleasePlugin):
     keep = 0  # by default, keep 'em all
     # by default, sort by parsed version string, time (of release) is the other option
     sort_by = "version"
+    # The releases dict of the package filtered last and the versions kept of it
+    _latest: tuple[dict, frozenset[str]] | None = None
 
     def initialize_plugin(self) -> None:
         """
@@ -59,30 +60,44 @@ class LatestReleaseFilter(FilterReleasePlugin):
         releases: dict = metadata["releases"]
         version: str = metadata["version"]
 
-        if self.keep == 0 or self.keep > len(releases):
+        keep = self.keep
+        if keep == 0 or keep > len(releases):
             return True
 
-        getter_index = 1
+        return version in self._latest_versions(info, releases)
+
+    def _latest_versions(self, info: dict, releases: dict) -> frozenset[str]:
+        """
+        Returns the versions to keep of a package
+
+        filter() is called once per release of a package, with the same
+        releases dict every time. Releases that are filtered out are removed
+        from it along the way, but as long as every kept version is still
+        there, removing the others can't change which versions are the latest
+        ones, so those are only picked again when that is no longer the case.
+        """
+        cached = self._latest
+        if cached is not None and cached[0] is releases:
+            if all(v in releases for v in cached[1]):
+                return cached[1]
+
+        # Select the first few (larger) versions, without sorting all the
+        # others. Comparing by key= keeps nlargest() working on the version
+        # strings themselves, there are no (key, version) pairs to build.
         if self.sort_by == "time":
-            getter_index = 0
-            versions_sorted = sorted(
-                releases.items(),
-                key=lambda x: x[1][0]["upload_time_iso_8601"],
-                reverse=True,
+            version_names = heapq.nlargest(
+                self.keep,
+                releases,
+                key=lambda v: releases[v][0]["upload_time_iso_8601"],
             )
         else:
-            versions_pair: Iterator[tuple[Version, str]] = map(
-                lambda v: (parse(v), v), releases.keys()
-            )
-            # Sort all versions
-            versions_sorted = sorted(versions_pair, reverse=True)
-        # Select the first few (larger) items
-        versions_allowed = versions_sorted[: self.keep]
-        # Collect string versions back into a list
-        version_names = list(map(itemgetter(getter_index), versions_allowed))
+            version_names = heapq.nlargest(self.keep, releases, key=cached_version)
 
         # Add back latest version if necessary
-        if info.get("version") not in version_names:
-            version_names[-1] = info.get("version")
+        current_version = info.get("version")
+        if current_version not in version_names:
+            version_names[-1] = current_version
 
-        return version in version_names
+        latest = frozenset(version_names)
+        self._latest = (releases, latest)
+        return latest
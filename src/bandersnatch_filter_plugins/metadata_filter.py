@@ -1,13 +1,17 @@
 import logging
 import re
 from configparser import SectionProxy
+from functools import lru_cache
 from typing import Any
 
 from humanfriendly import InvalidSize, parse_size
 from packaging.specifiers import SpecifierSet
-from packaging.version import parse
 
 from bandersnatch_filter_plugins.allowlist_name import AllowListProject
+from bandersnatch_filter_plugins.caching import (
+    cached_specifier_set,
+    cached_version,
+)
 
 from bandersnatch.filter import Filter  # isort:skip
 from bandersnatch.filter import FilterMetadataPlugin  # isort:skip
@@ -16,6 +20,37 @@ from bandersnatch.filter import FilterReleaseFilePlugin  # isort:skip
 
 logger = logging.getLogger("bandersnatch")
 
+_DEFAULT_FLAGS = re.compile("").flags
+
+
+def _combine_patterns(patterns: list[re.Pattern]) -> re.Pattern | None:
+    """
+    Join the patterns into a single alternation, so a value is matched against
+    all of them in one call. Returns None if there is nothing to gain or if
+    joining them could change what they match (groups would be renumbered for
+    backreferences and inline flags are only allowed at the very start).
+    """
+    if len(patterns) < 2:
+        return None
+    if any(pattern.groups or pattern.flags != _DEFAULT_FLAGS for pattern in patterns):
+        return None
+    return re.compile("|".join(f"(?:{pattern.pattern})" for pattern in patterns))
+
+
+# The configured keys are fixed, so split them up once rather than on every call
+@lru_cache(maxsize=256)
+def _split_key(key: str) -> tuple[tuple[str, ...], str]:
+    """
+    Split a configuration key into its tags and the dotted path to the node
+    """
+    *tags, path = key.split(":")
+    return tuple(tags), path
+
+
+@lru_cache(maxsize=256)
+def _split_path(path: str) -> tuple[str, ...]:
+    return tuple(path.split("."))
+
 
 class RegexFilter(Filter):
     """
@@ -28,6 +63,8 @@ class RegexFilter(Filter):
     nulls_match = True
     initialized = False
     patterns: dict = {}
+    # The patterns of each key joined together, where that is possible
+    combined_patterns: dict[str, re.Pattern] = {}
 
     def initialize_plugin(self) -> None:
         """
@@ -40,6 +77,7 @@ class RegexFilter(Filter):
         else:
             logger.info(f"Initializing {self.name} plugin")
             if not self.initialized:
+                self.combined_patterns = {}
                 for k in config:
                     pattern_strings = [
                         pattern for pattern in config[k].split("\n") if pattern
@@ -47,6 +85,9 @@ class RegexFilter(Filter):
                     self.patterns[k] = [
                         re.compile(pattern_string) for pattern_string in pattern_strings
                     ]
+                    combined = _combine_patterns(self.patterns[k])
+                    if combined is not None:
+                        self.combined_patterns[k] = combined
                 logger.info(f"Initialized {self.name} plugin with {self.patterns}")
                 self.initialized = True
 
@@ -62,11 +103,9 @@ class RegexFilter(Filter):
         return all(self._match_node_at_path(k, metadata) for k in self.patterns)
 
     def _match_node_at_path(self, key: str, metadata: dict) -> bool:
-        # Grab any tags prepended to key
-        tags = key.split(":")
-
-        # Take anything following the last semicolon as the path to the node
-        path = tags.pop()
+        # Grab any tags prepended to key, anything following the last
+        # semicolon is the path to the node
+        tags, path = _split_key(key)
 
         # Set our default matching rules for each key
         match_patterns = self.match_patterns
@@ -100,7 +139,7 @@ class RegexFilter(Filter):
     # TODO: Add unittest and cleanup code + fix typing
     def _find_element_by_dotted_path(self, path: str, metadata: dict) -> list:
         # Walk our metadata structure following dotted path.
-        split_path = path.split(".")
+        split_path = _split_path(path)
         node = metadata
         for p in split_path:
             if p in node and node[p] is not None:
@@ -115,14 +154,14 @@ class RegexFilter(Filter):
     def _match_any_patterns(
         self, key: str, values: list[str], nulls_match: bool = True
     ) -> bool:
-        results = []
-        for pattern in self.patterns[key]:
-            if nulls_match and not values:
-                results.append(True)
-                continue
-            for value in values:
-                results.append(pattern.match(value))
-        return any(results)
+        if nulls_match and not values:
+            return bool(self.patterns[key])
+        combined = self.combined_patterns.get(key)
+        if combined is not None:
+            return any(combined.match(value) for value in values)
+        return any(
+            pattern.match(value) for pattern in self.patterns[key] for value in values
+        )
 
     def _match_all_patterns(
         self, key: str, values: list[str], nulls_match: bool = True
@@ -188,7 +227,7 @@ class SizeProjectMetadataFilter(FilterMetadataPlugin, AllowListProject):
     name = "size_project_metadata"
     initialized = False
     max_package_size: int = 0
-    allowlist_package_names: list[str] = []
+    allowlist_package_names: frozenset[str] = frozenset()
 
     def initialize_plugin(self) -> None:
         """
@@ -245,12 +284,16 @@ class SizeProjectMetadataFilter(FilterMetadataPlugin, AllowListProject):
         ):
             return True
 
+        # Stop adding up as soon as the project is known to be too large
+        max_package_size = self.max_package_size
         total_size = 0
         for release in metadata["releases"].values():
             for file in release:
                 total_size += file["size"]
+                if total_size > max_package_size:
+                    return False
 
-        return total_size <= self.max_package_size
+        return True
 
 
 class VersionRangeFilter(Filter):
@@ -279,7 +322,7 @@ class VersionRangeFilter(Filter):
                 for k in config:
                     # self.specifiers[k] = SpecifierSet(config[k])
                     self.specifiers[k] = [
-                        parse(ver) for ver in config[k].split("\n") if ver
+                        cached_version(ver) for ver in config[k].split("\n") if ver
                     ]
                 logger.info(
                     f"Initialized version_range_release_file_metadata plugin with {self.specifiers}"  # noqa: E501
@@ -300,7 +343,7 @@ class VersionRangeFilter(Filter):
 
     def _find_element_by_dotted_path(self, path: str, metadata: dict) -> Any:
         # Walk our metadata structure following dotted path.
-        split_path = path.split(".")
+        split_path = _split_path(path)
         node = metadata
         for p in split_path:
             if p in node and node[p] is not None:
@@ -311,11 +354,9 @@ class VersionRangeFilter(Filter):
         return node
 
     def _match_node_at_path(self, key: str, metadata: dict) -> bool:
-        # Grab any tags prepended to key
-        tags = key.split(":")
-
-        # Take anything following the last semicolon as the path to the node
-        path = tags.pop()
+        # Grab any tags prepended to key, anything following the last
+        # semicolon is the path to the node
+        tags, path = _split_key(key)
 
         # Set our default matching rules for each key
         nulls_match = self.nulls_match
@@ -337,14 +378,12 @@ class VersionRangeFilter(Filter):
 
         # Check if SpeciferSet matches target versions
         # TODO: Figure out proper intersection of SpecifierSets
-        ospecs: SpecifierSet = SpecifierSet(node)
+        ospecs: SpecifierSet = cached_specifier_set(node)
         ispecs = self.specifiers[key]
         if any(ospecs.contains(ispec, prereleases=True) for ispec in ispecs):
             return True
         # Otherwise, fail
-        logger.info(
-            f"Failed check for {key}='{ospecs}' against '{ispecs}'"  # noqa: E501
-        )
+        logger.info("Failed check for %s='%s' against '%s'", key, ospecs, ispecs)
         return False
 
 
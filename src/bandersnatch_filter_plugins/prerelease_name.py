@@ -22,6 +22,8 @@ class PreReleaseFilter(FilterReleasePlugin):
         r".+dev\d+$",
     )
     patterns: list[Pattern] = []
+    # All of the patterns as one alternation, matched in a single call
+    _patterns_re: Pattern
     package_names: list[str] = []
 
     def initialize_plugin(self) -> None:
@@ -34,6 +36,9 @@ class PreReleaseFilter(FilterReleasePlugin):
                 for pattern_string in self.PRERELEASE_PATTERNS
             ]
             logger.info(f"Initialized prerelease plugin with {self.patterns}")
+        self._patterns_re = re.compile(
+            "|".join(f"(?:{pattern.pattern})" for pattern in self.patterns)
+        )
 
         if not self.package_names:
             try:
@@ -58,4 +63,4 @@ class PreReleaseFilter(FilterReleasePlugin):
         version = metadata["version"]
         if self.package_names and name not in self.package_names:
             return True
-        return not any(pattern.match(version) for pattern in self.patterns)
+        return self._patterns_re.match(version) is None